@@ -1,3 +1,47 @@
 # config.py
 GOOGLE_SHEET_URL = "https://docs.google.com/spreadsheets/d/1_7nl2F8Vfd90h8ce2TreDW5D_m3WHr6vEFtg10xz3BI/export?format=csv&gid=1821075619"
 
+# Columns read from the sheet; "Email Address" and the free-text goals question are never used
+DEMOGRAPHIC_COLS = [
+    "Age (Years)",
+    "Gender",
+    "Marital Status",
+    "Highest Level of Education",
+    "Employment Status",
+    "State",
+    "Main Language Spoken at Home",
+]
+
+# 1-5 scale questions (nullable so a blank answer does not fail the parse;
+# Int16 because pyarrow wraps out-of-range Int8 values instead of raising)
+LIKERT_COLS = [
+    "How often do you feel satisfied with your life as a whole these days?",
+    "I have felt cheerful and in good spirits.",
+    "I have woken up feeling fresh and rested.",
+    "In general, how would you describe your overall health?",
+    "I often spend time with friends or family. ",
+    "I often try to help others when they are in need.  ",
+    "People around me are supportive when I face difficulties.  ",
+    "With enough effort everyone can increase their social skills. ",
+    "I feel safe in my neighborhood.  ",
+    "People in my community care about one another. ",
+    "I believe I can make a positive difference in my community.",
+    "I enjoy learning new things in my daily life.  ",
+    "I am motivated to improve my skills and knowledge. ",
+    "I can stay calm even when under pressure.  ",
+    "I can control my emotions when I feel angry or upset.  ",
+    "I find it easy to work well with others.  ",
+    "I finish tasks even when they are difficult.  ",
+    "I can adapt easily to new or unexpected situations. ",
+    "Some people are just not good at interacting with others, no matter how hard they try. ",
+    "Everyone deserves equal opportunities to succeed.  ",
+    "I believe emotional well-being is as important as physical health.  ",
+    "How often do you participate in community, volunteer, or group activities?  ",
+    "How often do you spend time doing physical exercise or sports?  ",
+]
+
+NEEDED_COLS = ["Timestamp"] + DEMOGRAPHIC_COLS + LIKERT_COLS
+NEEDED_DTYPES = {
+    **{c: "category" for c in DEMOGRAPHIC_COLS},
+    **{c: "Int16" for c in LIKERT_COLS},
+}
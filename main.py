@@ -67,6 +67,13 @@ IMAGE_PATH = BASE_DIR / "assets" / "sses_background.jpg"
 bg_image = get_base64_image(str(IMAGE_PATH))
 set_background(bg_image)
 
+# ======================================
+# DATA REFRESH
+# ======================================
+# Clears every shared loader: load_data() and the Emotion Resilience dataset
+if st.sidebar.button("🔄 Refresh data"):
+    st.cache_resource.clear()
+
 # ======================================
 # RUN NAVIGATION
 # ======================================
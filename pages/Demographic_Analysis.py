@@ -1,24 +1,32 @@
 import streamlit as st
 import plotly.express as px
-from preprocess import load_data
+from preprocess import load_data, cache_on_frame
+
+@cache_on_frame
+def _demo_counts(df, cols):
+    # One pass for every selectable column, so switching the selectbox is a lookup
+    return {c: df[c].value_counts() for c in cols if c in df.columns}
 
 st.title("👥 Demographic Analysis")
 st.markdown("Explore the background and characteristics of the survey respondents.")
 
 df = load_data()
 
+demo_options = ['gender', 'age', 'location', 'education_level'] if 'gender' in df.columns else list(df.columns)
+counts = _demo_counts(df, tuple(demo_options))
+
 # Selection for distribution
 demo_col = st.selectbox(
     "Select Demographic Variable to Visualize",
-    options=['gender', 'age', 'location', 'education_level'] if 'gender' in df.columns else df.columns
+    options=list(counts)
 )
 
 col1, col2 = st.columns([2, 1])
 
 with col1:
     fig = px.pie(
-        df, 
-        names=demo_col, 
+        names=counts[demo_col].index,
+        values=counts[demo_col].values,
         hole=0.4,
         title=f"Distribution of {demo_col.replace('_', ' ').title()}",
         color_discrete_sequence=px.colors.qualitative.Pastel
@@ -27,5 +35,4 @@ with col1:
 
 with col2:
     st.write("### Quick Stats")
-    stats = df[demo_col].value_counts()
-    st.dataframe(stats, use_container_width=True)
+    st.dataframe(counts[demo_col], use_container_width=True)
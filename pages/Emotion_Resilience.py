@@ -1,8 +1,15 @@
+import io
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import requests
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
+from preprocess import cache_on_frame
 
 # ======================================
 # PAGE HEADER
@@ -32,60 +39,260 @@ with st.container():
 # ======================================
 DATA_URL = "https://raw.githubusercontent.com/nhusna01/SSES-survey-dashboard/main/dataset/Hafizah_SSES_Cleaned.csv"
 
-@st.cache_data(ttl=3600)
+# Offline snapshot tracked with the app
+BUNDLED_CSV = Path(__file__).resolve().parent.parent / "dataset" / "Hafizah_SSES_Cleaned.csv"
+
+# Local parquet mirror of the remote CSV, revalidated with a conditional GET
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
+LOCAL_PARQUET = CACHE_DIR / "Hafizah_SSES_Cleaned.parquet"
+LOCAL_META = CACHE_DIR / "Hafizah_SSES_Cleaned.json"
+
+def _write_atomic(path, data):
+    # Write next to the target and swap in, so an interrupted write never leaves a corrupt mirror
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def _read_fallback():
+    for path, reader in ((LOCAL_PARQUET, pd.read_parquet), (BUNDLED_CSV, pd.read_csv)):
+        try:
+            return reader(path)
+        except Exception:
+            continue
+    return None
+
+def fetch_with_revalidation():
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    if LOCAL_PARQUET.exists() and LOCAL_META.exists():
+        meta = json.loads(LOCAL_META.read_text())
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = requests.get(DATA_URL, headers=headers, timeout=30)
+    if response.status_code == 304:
+        try:
+            return pd.read_parquet(LOCAL_PARQUET, engine="pyarrow")
+        except Exception:
+            # Unreadable mirror: forget its validators and download it again
+            LOCAL_META.unlink(missing_ok=True)
+            return fetch_with_revalidation()
+    response.raise_for_status()
+
+    data = pd.read_csv(io.BytesIO(response.content))
+    buffer = io.BytesIO()
+    data.to_parquet(buffer, engine="pyarrow", index=False)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _write_atomic(LOCAL_PARQUET, buffer.getvalue())
+        _write_atomic(LOCAL_META, json.dumps({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }).encode())
+    except OSError as e:
+        # Read-only or full disk: the fresh download is still good, just not mirrored
+        logging.getLogger(__name__).warning("Could not write the local mirror in %s (%s)", CACHE_DIR, e)
+    return data
+
+OBJECTIVE3_COLS = ['calm_under_pressure', 'emotional_control', 'adaptability', 'self_motivation', 'task_persistence', 'teamwork']
+
+# Shared (not copied) across reruns so the helpers below can key on frame_key;
+# callers must not mutate the returned DataFrame.
+@st.cache_resource(ttl=3600)
 def load_emotion_data():
     try:
-        data = pd.read_csv(DATA_URL, storage_options={'User-Agent': 'Mozilla/5.0'})
-        return data
+        data = fetch_with_revalidation()
     except Exception as e:
+        # Serve the last good copy when the remote host is unreachable, but say so
+        logging.getLogger(__name__).warning("Could not refresh %s (%s); serving a saved copy", DATA_URL, e)
+        data = _read_fallback()
+        if data is not None:
+            st.warning("⚠️ Could not refresh the dataset from GitHub; showing the last saved copy.")
+    if data is None:
         st.error(f"⚠️ Could not connect to the dataset.")
         return None
 
+    # Pre-process numeric data (float32: the cleaned scores include half points such as 1.5)
+    cols = [c for c in OBJECTIVE3_COLS if c in data.columns]
+    data[cols] = data[cols].apply(pd.to_numeric, errors="coerce")
+    data[cols] = data[cols].fillna(data[cols].median()).astype("float32")
+    data.attrs["loaded_at"] = time.time()
+    return data
+
+# ======================================
+# CACHED DERIVATIONS
+# ======================================
+# Keyed on frame_key via cache_on_frame (O(1)) instead of hashing the frame,
+# so df must come from load_emotion_data().
+@cache_on_frame
+def _melt(df, cols):
+    return df.melt(value_vars=list(cols), var_name="Attribute", value_name="Score")
+
+@cache_on_frame
+def _melt_sampled(df, cols, cap=2000):
+    # Same rows for every attribute, so each gets at most `cap` scores
+    sample = df if len(df) <= cap else df.sample(cap, random_state=0)
+    return sample.melt(value_vars=list(cols), var_name="Attribute", value_name="Score")
+
+@cache_on_frame
+def _box_stats(df, cols):
+    # Tukey box statistics computed here so the box plot ships no raw scores
+    arr = df[list(cols)].to_numpy(np.float32)
+    q1, median, q3 = np.percentile(arr, [25, 50, 75], axis=0)
+    iqr = q3 - q1
+    lower = np.where(arr >= q1 - 1.5 * iqr, arr, np.inf).min(axis=0)
+    upper = np.where(arr <= q3 + 1.5 * iqr, arr, -np.inf).max(axis=0)
+    return pd.DataFrame({
+        'Attribute': list(cols), 'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': lower, 'upperfence': upper,
+    })
+
+@cache_on_frame
+def _corr(df, cols, k=3):
+    corr = df[list(cols)].astype("float32").corr()
+
+    # Top-k pairs from the upper triangle (each pair once, no diagonal)
+    iu = np.triu_indices(len(cols), k=1)
+    vals = corr.to_numpy()[iu]
+    k = min(k, len(vals))
+    idx = np.argpartition(-vals, k - 1)[:k] if k else np.array([], dtype=int)
+    idx = idx[np.argsort(-vals[idx])]
+    names = np.asarray(cols)
+    top_pairs = pd.DataFrame(
+        {'Correlation Strength': vals[idx]},
+        index=pd.MultiIndex.from_arrays([names[iu[0][idx]], names[iu[1][idx]]])
+    )
+    return corr, top_pairs
+
+@cache_on_frame
+def _mean(df, cols):
+    return df[list(cols)].mean()
+
+@cache_on_frame
+def _radar_arrays(df, cols, labels):
+    # Closed polygon: repeat the first point at the end
+    m = df[list(cols)].to_numpy(np.float32).mean(axis=0)
+    r = np.concatenate([m, m[:1]])
+    theta = np.array(list(labels) + [labels[0]])
+    return r, theta
+
+@cache_on_frame
+def _point_counts(df, cols):
+    # Pre-aggregated overlay for the violin plot: constant size regardless of respondents
+    counts = _melt(df, cols).groupby(["Attribute", "Score"]).size().reset_index(name="Count")
+    counts["Size"] = 6 + 24 * np.sqrt(counts["Count"] / counts["Count"].max())
+    return counts
+
+@cache_on_frame
+def _sentiment(df, cols):
+    # Share of each Likert level (1-5) per column in one vectorized sweep
+    # (half-point scores fall outside every level, as with value_counts)
+    arr = df[list(cols)].to_numpy(np.float32)
+    counts = np.zeros((len(cols), 5), dtype=np.int32)
+    for i in range(5):
+        counts[:, i] = (arr == i + 1).sum(axis=0)
+    share = counts / arr.shape[0] * 100
+    return pd.DataFrame({
+        'Attribute': list(cols),
+        'Disagree': -(share[:, 0] + share[:, 1]),
+        'Neutral': share[:, 2],
+        'Agree': share[:, 3] + share[:, 4],
+    })
+
+@cache_on_frame
+def _tree_data(df, cols, labels):
+    return pd.DataFrame({
+        "Attribute": list(labels),
+        "Mean Score": _mean(df, cols).values
+    }).sort_values(by="Mean Score", ascending=False)
+
+@cache_on_frame
+def _build_figures(df, cols, labels):
+    # Every static figure on the page, built once per dataset load
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    r_closed, theta_closed = _radar_arrays(df, cols, labels)
+    fig_radar = go.Figure(data=go.Scatterpolar(
+        r=r_closed,
+        theta=theta_closed,
+        fill='toself', fillcolor='rgba(31, 119, 180, 0.4)', line_color='#1f77b4'
+    ))
+    fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 5])), showlegend=False)
+
+    corr, _ = _corr(df, cols)
+    fig_corr = px.imshow(corr, text_auto=".2f", color_continuous_scale="RdBu_r", aspect="auto", height=500)
+
+    fig_violin = px.violin(_melt_sampled(df, cols), x="Attribute", y="Score", color="Attribute", box=True, points=False)
+
+    fig_sent = px.bar(_sentiment(df, cols), x=['Disagree', 'Neutral', 'Agree'], y='Attribute', 
+                      orientation='h', barmode='relative',
+                      color_discrete_map={'Disagree': '#EF553B', 'Neutral': '#FECB52', 'Agree': '#00CC96'},
+                      title="Diverging Likert Scale (Sentiment)")
+
+    fig_tree = px.treemap(_tree_data(df, cols, labels), path=['Attribute'], values='Mean Score',
+                          color='Mean Score', color_continuous_scale='Blues')
+
+    fig_box = go.Figure([
+        go.Box(x=[row.Attribute], q1=[row.q1], median=[row.median], q3=[row.q3],
+               lowerfence=[row.lowerfence], upperfence=[row.upperfence], name=row.Attribute,
+               marker_color=px.colors.qualitative.Plotly[i % len(px.colors.qualitative.Plotly)])
+        for i, row in enumerate(_box_stats(df, cols).itertuples())
+    ])
+    fig_box.update_layout(xaxis_title="Attribute", yaxis_title="Score", legend_title_text="Attribute")
+
+    return {'radar': fig_radar, 'corr': fig_corr, 'violin': fig_violin,
+            'sent': fig_sent, 'tree': fig_tree, 'box': fig_box}
+
 df = load_emotion_data()
 
 if df is not None:
-    objective3_cols = ['calm_under_pressure', 'emotional_control', 'adaptability', 'self_motivation', 'task_persistence', 'teamwork']
-    available_cols = [c for c in objective3_cols if c in df.columns]
+    # Plotly is only imported once there is something to plot
+    import plotly.graph_objects as go
+
+    available_cols = [c for c in OBJECTIVE3_COLS if c in df.columns]
+    pretty = {c: c.replace('_', ' ').title() for c in available_cols}
+    pretty_labels = [pretty[c] for c in available_cols]
 
     if not available_cols:
         st.error("❌ Required columns not found.")
     else:
-        # Pre-process numeric data
-        df[available_cols] = df[available_cols].apply(pd.to_numeric, errors="coerce").fillna(df[available_cols].median())
+        figs = _build_figures(df, tuple(available_cols), tuple(pretty_labels))
 
         # ======================================
         # 1. RADAR CHART
         # ======================================
         st.subheader("1. Average Resilience Profile")
-        mean_scores = df[available_cols].mean()
-        fig_radar = go.Figure(data=go.Scatterpolar(
-            r=mean_scores.values.tolist() + [mean_scores.values[0]],
-            theta=[c.replace('_', ' ').title() for c in available_cols] + [available_cols[0].replace('_', ' ').title()],
-            fill='toself', fillcolor='rgba(31, 119, 180, 0.4)', line_color='#1f77b4'
-        ))
-        fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 5])), showlegend=False)
-        st.plotly_chart(fig_radar, use_container_width=True)
+        mean_scores = _mean(df, tuple(available_cols))
+        st.plotly_chart(figs['radar'], use_container_width=True)
         
-        st.markdown(f"**💡 Insight:** Core group strength is **{mean_scores.idxmax().replace('_',' ').title()}**.")
+        st.markdown(f"**💡 Insight:** Core group strength is **{pretty[mean_scores.idxmax()]}**.")
 
         # ======================================
         # 2. CORRELATION ANALYSIS
         # ======================================
         st.subheader("2. Attribute Correlation Matrix")
-        corr = df[available_cols].corr()
-        fig_corr = px.imshow(corr, text_auto=".2f", color_continuous_scale="RdBu_r", aspect="auto", height=500)
-        st.plotly_chart(fig_corr, use_container_width=True)
+        corr, top_pairs = _corr(df, tuple(available_cols))
+        st.plotly_chart(figs['corr'], use_container_width=True)
         
         st.markdown("**📌 Key Finding: Top Relationship Pairs**")
-        high_corr = corr.unstack().sort_values(ascending=False).drop_duplicates()
-        st.table(pd.DataFrame(high_corr[high_corr < 1].head(3), columns=['Correlation Strength']))
+        st.table(top_pairs)
 
         # ======================================
         # 3. VIOLIN PLOT (DENSITY)
         # ======================================
         st.subheader("3. Score Density & Distribution")
-        df_melted = df.melt(value_vars=available_cols, var_name="Attribute", value_name="Score")
-        fig_violin = px.violin(df_melted, x="Attribute", y="Score", color="Attribute", box=True, points="all")
+        fig_violin = figs['violin']
+        if st.checkbox("Show individual points"):
+            # One marker per (attribute, score) pair sized by respondent count
+            point_counts = _point_counts(df, tuple(available_cols))
+            fig_violin.add_trace(go.Scatter(
+                x=point_counts["Attribute"], y=point_counts["Score"], mode="markers",
+                marker=dict(size=point_counts["Size"], color="rgba(40, 40, 40, 0.5)"),
+                customdata=point_counts["Count"], hovertemplate="%{x}<br>Score %{y}: %{customdata} respondents<extra></extra>",
+                showlegend=False
+            ))
         st.plotly_chart(fig_violin, use_container_width=True)
         
         st.write("**Interpretation:** The width of the violin represents the frequency of scores. ")
@@ -95,24 +302,8 @@ if df is not None:
         # ======================================
         st.subheader("4. Sentiment Analysis (Agreement vs Disagreement)")
         
-        def get_sentiment(series):
-            # series is already the column data because of .apply()
-            counts = series.value_counts(normalize=True).reindex([1,2,3,4,5], fill_value=0)
-            disagree = -(counts[1] + counts[2]) * 100
-            neutral = counts[3] * 100
-            agree = (counts[4] + counts[5]) * 100
-            return pd.Series([disagree, neutral, agree], index=['Disagree', 'Neutral', 'Agree'])
-
-        # Apply to the dataframe and transpose
-        sentiment_df = df[available_cols].apply(get_sentiment).T.reset_index()
-        sentiment_df.columns = ['Attribute', 'Disagree', 'Neutral', 'Agree']
-
-        fig_sent = px.bar(sentiment_df, x=['Disagree', 'Neutral', 'Agree'], y='Attribute', 
-                          orientation='h', barmode='relative',
-                          color_discrete_map={'Disagree': '#EF553B', 'Neutral': '#FECB52', 'Agree': '#00CC96'},
-                          title="Diverging Likert Scale (Sentiment)")
-        
-        st.plotly_chart(fig_sent, use_container_width=True)
+        sentiment_df = _sentiment(df, tuple(available_cols))
+        st.plotly_chart(figs['sent'], use_container_width=True)
         
         st.markdown("**📌 Key Finding: Sentiment Data**")
         st.dataframe(sentiment_df)
@@ -121,20 +312,14 @@ if df is not None:
         # 5. ATTRIBUTE HIERARCHY
         # ======================================
         st.subheader("5. Attribute Hierarchy Ranking")
-        tree_data = pd.DataFrame({
-            "Attribute": [c.replace('_', ' ').title() for c in available_cols],
-            "Mean Score": mean_scores.values
-        }).sort_values(by="Mean Score", ascending=False)
-        fig_tree = px.treemap(tree_data, path=['Attribute'], values='Mean Score',
-                              color='Mean Score', color_continuous_scale='Blues')
-        st.plotly_chart(fig_tree, use_container_width=True)
+        tree_data = _tree_data(df, tuple(available_cols), tuple(pretty_labels))
+        st.plotly_chart(figs['tree'], use_container_width=True)
 
         # ======================================
         # 6. BOXPLOT (VARIABILITY)
         # ======================================
         st.subheader("6. Variability & Range Analysis")
-        fig_box = px.box(df_melted, x="Attribute", y="Score", color="Attribute")
-        st.plotly_chart(fig_box, use_container_width=True)
+        st.plotly_chart(figs['box'], use_container_width=True)
         
         # ======================================
         # CONCLUSION
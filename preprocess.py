@@ -1,9 +1,29 @@
+import logging
+import time
+
 import pandas as pd
 import streamlit as st
-from configuration import GOOGLE_SHEET_URL
+from configuration import GOOGLE_SHEET_URL, NEEDED_COLS, NEEDED_DTYPES
 
-@st.cache_data(ttl=15)   # refresh every 15 seconds
+# cache_resource hands every page the same DataFrame object (no copy per run),
+# so callers must not mutate it in place -- use .assign()/.copy() instead.
+@st.cache_resource(ttl=900)   # refresh every 15 minutes
 def load_data():
-    df = pd.read_csv(GOOGLE_SHEET_URL)
+    try:
+        df = pd.read_csv(GOOGLE_SHEET_URL, usecols=NEEDED_COLS, dtype=NEEDED_DTYPES, engine="pyarrow")
+    except (KeyError, ValueError) as e:
+        # A question was reworded or re-typed on the form: read every column
+        # unpruned rather than fail every page, until configuration.py catches up
+        logging.getLogger(__name__).warning("Pruned read of the survey sheet failed (%s); reading all columns", e)
+        df = pd.read_csv(GOOGLE_SHEET_URL)
+    df.attrs["loaded_at"] = time.time()
     return df
 
+# O(1) cache key for frames returned by the cached loaders. The load time keeps
+# a recycled id() from matching a frame loaded after a refresh.
+def frame_key(df):
+    return id(df), df.attrs.get("loaded_at")
+
+# Decorator for helpers that take a loader's DataFrame. Every reload yields a
+# new key, so only the current and previous load are kept.
+cache_on_frame = st.cache_data(hash_funcs={pd.DataFrame: frame_key}, max_entries=2)